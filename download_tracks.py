@@ -4,15 +4,117 @@ Unified track download script for both Beatport and Spotify sources.
 """
 
 import argparse
-from youtube_to_mp3 import download_youtube_to_mp3
-from utils import load_tracks
+import os
+import queue
+import threading
+from contextlib import ExitStack
+from youtube_to_mp3 import download_youtube_to_mp3, download_url, print_download_summary, worker_ydl
+from utils import Config, FileManager, YouTubeSearcher, load_tracks
+
+def run_pipeline(source: str, download_workers: int = Config.DOWNLOAD_WORKERS):
+    """
+    Search YouTube and download matches concurrently.
+    
+    Search results are handed to a pool of download threads through a
+    bounded queue as soon as they are found, so downloading overlaps with
+    the remaining searches instead of waiting for all of them to finish.
+    """
+    Config.ensure_dirs()
+    
+    if source == 'beatport':
+        tracks = FileManager.load_tracks_json_cached(Config.EXTRACTED_TRACKS_JSON)
+        results_path = Config.TRACKS_WITH_YOUTUBE_JSON
+    elif source == 'spotify':
+        tracks = FileManager.load_spotify_csv(Config.SPOTIFY_CSV)
+        results_path = Config.SPOTIFY_TRACKS_WITH_YOUTUBE_JSON
+    else:
+        raise ValueError(f"Unknown source: {source}. Use 'beatport' or 'spotify'")
+    
+    output_dir = str(Config.OUTPUT_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    url_queue = queue.Queue(maxsize=32)
+    results_lock = threading.Lock()
+    successful_downloads = []
+    failed_downloads = []
+    
+    seen_urls = set()
+    
+    def downloader():
+        with ExitStack() as stack:
+            # YoutubeDL isn't thread-safe, so each worker reuses its own instance
+            try:
+                ydl = stack.enter_context(worker_ydl(output_dir))
+                setup_error = None
+            except Exception as e:
+                # Keep draining the queue so the search never blocks on put()
+                print(f"✗ Download worker failed to start: {e}")
+                ydl = None
+                setup_error = str(e)
+            
+            while True:
+                url = url_queue.get()
+                if url is None:
+                    break
+                error = download_url(url, ydl) if ydl is not None else setup_error
+                with results_lock:
+                    if error is None:
+                        successful_downloads.append(url)
+                    else:
+                        failed_downloads.append((url, error))
+    
+    def enqueue(track):
+        url = track.youtube_url
+        if not url:
+            return
+        # Tracks with the same title resolve to the same URL, and duplicate
+        # URLs would race on one output file
+        with results_lock:
+            if url in seen_urls:
+                return
+            seen_urls.add(url)
+        url_queue.put(url)
+    
+    workers = [threading.Thread(target=downloader, daemon=True) for _ in range(download_workers)]
+    for worker in workers:
+        worker.start()
+    
+    print(f"Searching and downloading {len(tracks)} {source} tracks...")
+    try:
+        YouTubeSearcher.search_batch(tracks, on_result=enqueue)
+    except BaseException:
+        # Drop queued URLs so only the downloads already running finish
+        while True:
+            try:
+                url_queue.get_nowait()
+            except queue.Empty:
+                break
+        raise
+    finally:
+        # One sentinel per worker drains the queue and stops the pool
+        for _ in workers:
+            url_queue.put(None)
+        for worker in workers:
+            worker.join()
+    
+    FileManager.save_tracks_json(tracks, results_path)
+    print(f"\nSearch results saved to {results_path}")
+    
+    print_download_summary(successful_downloads, failed_downloads)
 
 def main():
     parser = argparse.ArgumentParser(description='Download tracks from Beatport or Spotify sources')
-    parser.add_argument('source', choices=['beatport', 'spotify'], 
+    parser.add_argument('source', choices=['beatport', 'spotify'],
                        help='Source of tracks to download')
+    parser.add_argument('--search', action='store_true',
+                       help='Search YouTube first, downloading matches while the search runs')
     
     args = parser.parse_args()
+    Config.setup_logging()
+    
+    if args.search:
+        run_pipeline(args.source)
+        return
     
     print(f"Loading {args.source} tracks...")
     youtube_urls = load_tracks(args.source)
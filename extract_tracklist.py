@@ -1,109 +1,191 @@
 #!/usr/bin/env python3
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import re
-import time
 import csv
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from utils import Config, DiskCache, FileManager, RateLimiter, Track
 
-def extract_track_info(url):
-    """Extract track name, artist, and duration from Beatport URL"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract track title - look for the actual track name in H1
-        title_element = soup.find('h1')
+try:
+    import httpx
+    import h2  # noqa: F401 - required by httpx for HTTP/2
+except ImportError:  # optional, fall back to the threaded requests scraper
+    httpx = None
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:  # pure-Python parser is much slower but always available
+    HTML_PARSER = 'html.parser'
+
+_DURATION_RE = re.compile(rb'\b\d{1,2}:\d{2}\b')
+_ARTIST_HREF_RE = re.compile(r'/artist/')
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# Parsed track metadata keyed by Beatport URL, so re-runs skip the network
+_cache = DiskCache(Config.BEATPORT_CACHE, expire_after=Config.BEATPORT_CACHE_TTL)
+
+# Keep-alive connection pool shared by all scraping threads
+session = requests.Session()
+session.headers['User-Agent'] = USER_AGENT
+session.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+))
+
+# Be respectful to the server: pace requests globally across threads
+_rate_limiter = RateLimiter(Config.SCRAPE_RATE)
+
+def parse_track_page(url, content):
+    """Parse track name, artist, and duration from a Beatport page's HTML"""
+    soup = BeautifulSoup(content, HTML_PARSER)
+    
+    # Extract track title - look for the actual track name in H1
+    title_element = soup.find('h1')
+    if title_element:
+        title = title_element.text.strip()
+        # Clean up duplicated feat. parts
+        if 'feat.' in title:
+            parts = title.split('feat.')
+            if len(parts) > 2:
+                title = parts[0] + 'feat.' + parts[1]
+            title = title.strip()
+    else:
+        # Fallback to page title
+        title_element = soup.find('title')
         if title_element:
-            title = title_element.text.strip()
-            # Clean up duplicated feat. parts
-            if 'feat.' in title:
-                parts = title.split('feat.')
-                if len(parts) > 2:
-                    title = parts[0] + 'feat.' + parts[1]
-                title = title.strip()
-        else:
-            # Fallback to page title
-            title_element = soup.find('title')
-            if title_element:
-                page_title = title_element.text
-                if ' - ' in page_title:
-                    # Extract everything after the artists and before the label
-                    parts = page_title.split(' - ')
-                    if len(parts) >= 2:
-                        title = parts[1].split(' [')[0].strip()
-                    else:
-                        title = 'Unknown Title'
+            page_title = title_element.text
+            if ' - ' in page_title:
+                # Extract everything after the artists and before the label
+                parts = page_title.split(' - ')
+                if len(parts) >= 2:
+                    title = parts[1].split(' [')[0].strip()
                 else:
                     title = 'Unknown Title'
             else:
                 title = 'Unknown Title'
-        
-        # Extract artist
-        artist_element = soup.find('p', class_='interior-track-artists')
-        if not artist_element:
-            artist_elements = soup.find_all('a', href=re.compile(r'/artist/'))
-            if artist_elements:
-                artist = ', '.join([a.text.strip() for a in artist_elements[:3]])
-            else:
-                artist = 'Unknown Artist'
         else:
-            artist_links = artist_element.find_all('a')
-            if artist_links:
-                artist = ', '.join([a.text.strip() for a in artist_links])
-            else:
-                artist = artist_element.text.strip()
-        
-        # Extract duration
-        duration_element = soup.find('p', class_='interior-track-length')
-        if not duration_element:
-            duration_pattern = re.compile(r'\b\d{1,2}:\d{2}\b')
-            duration_match = duration_pattern.search(response.text)
-            duration = duration_match.group() if duration_match else 'Unknown Duration'
+            title = 'Unknown Title'
+    
+    # Extract artist
+    artist_element = soup.find('p', class_='interior-track-artists')
+    if not artist_element:
+        artist_elements = soup.find_all('a', href=_ARTIST_HREF_RE)
+        if artist_elements:
+            artist = ', '.join([a.text.strip() for a in artist_elements[:3]])
         else:
-            duration = duration_element.text.strip()
-        
-        return {
-            'title': title,
-            'artist': artist,
-            'duration': duration,
-            'url': url
-        }
-        
+            artist = 'Unknown Artist'
+    else:
+        artist_links = artist_element.find_all('a')
+        if artist_links:
+            artist = ', '.join([a.text.strip() for a in artist_links])
+        else:
+            artist = artist_element.text.strip()
+    
+    # Extract duration
+    duration_element = soup.find('p', class_='interior-track-length')
+    if not duration_element:
+        # Search the raw bytes to avoid decoding the whole page
+        duration_match = _DURATION_RE.search(content)
+        duration = duration_match.group().decode() if duration_match else 'Unknown Duration'
+    else:
+        duration = duration_element.text.strip()
+    
+    return {
+        'title': title,
+        'artist': artist,
+        'duration': duration,
+        'url': url
+    }
+
+def _error_info(url):
+    return {
+        'title': 'Error',
+        'artist': 'Error',
+        'duration': 'Error',
+        'url': url
+    }
+
+def extract_track_info(url):
+    """Extract track name, artist, and duration from Beatport URL"""
+    cached = _cache.get(url)
+    if cached is not None:
+        return {**cached, 'url': url}
+    
+    try:
+        _rate_limiter.acquire()
+        response = session.get(url)
+        response.raise_for_status()
+        track_info = parse_track_page(url, response.content)
+    except Exception as e:
+        print(f"Error processing {url}: {str(e)}")
+        return _error_info(url)
+    
+    _cache.set(url, {key: track_info[key] for key in ('title', 'artist', 'duration')})
+    return track_info
+
+async def extract_track_info_async(client, url, semaphore):
+    """Async variant of extract_track_info using a shared httpx client"""
+    cached = _cache.get(url)
+    if cached is not None:
+        return {**cached, 'url': url}
+    
+    try:
+        async with semaphore:
+            await _rate_limiter.acquire_async()
+            response = await client.get(url)
+        response.raise_for_status()
+        track_info = parse_track_page(url, response.content)
     except Exception as e:
         print(f"Error processing {url}: {str(e)}")
-        return {
-            'title': 'Error',
-            'artist': 'Error',
-            'duration': 'Error',
-            'url': url
-        }
+        return _error_info(url)
+    
+    _cache.set(url, {key: track_info[key] for key in ('title', 'artist', 'duration')})
+    return track_info
+
+async def extract_tracks_async(urls):
+    """Fetch all URLs concurrently over a single multiplexed HTTP/2 connection"""
+    semaphore = asyncio.Semaphore(Config.SCRAPE_WORKERS)
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=20)
+    )
+    processed = 0
+    
+    async with httpx.AsyncClient(transport=transport, headers={'User-Agent': USER_AGENT}, follow_redirects=True) as client:
+        async def fetch(url):
+            nonlocal processed
+            track_info = await extract_track_info_async(client, url, semaphore)
+            processed += 1
+            print(f"Processed track {processed}/{len(urls)}: {url}")
+            return track_info
+        
+        return await asyncio.gather(*(fetch(url) for url in urls))
 
 def main():
-    from utils import Config
     Config.ensure_dirs()
     
     # Read URLs from tracklist.txt
     with open(Config.TRACKLIST_TXT, 'r') as file:
-        urls = [line.strip() for line in file if line.strip()]
+        urls = [url for url in map(str.strip, file) if url]
     
     print(f"Found {len(urls)} tracks to process")
     
-    tracks = []
-    
-    for i, url in enumerate(urls, 1):
-        print(f"Processing track {i}/{len(urls)}: {url}")
-        track_info = extract_track_info(url)
-        tracks.append(track_info)
-        
-        # Be respectful to the server
-        time.sleep(1)
+    if httpx is not None:
+        tracks = asyncio.run(extract_tracks_async(urls))
+    else:
+        tracks = []
+        with ThreadPoolExecutor(max_workers=Config.SCRAPE_WORKERS) as executor:
+            for i, track_info in enumerate(executor.map(extract_track_info, urls), 1):
+                print(f"Processed track {i}/{len(urls)}: {track_info['url']}")
+                tracks.append(track_info)
     
     # Output results
     print("\n" + "="*80)
@@ -117,10 +199,6 @@ def main():
         print(f"    URL: {track['url']}")
         print()
     
-    # Save to JSON using utils
-    from utils import Config, FileManager, Track
-    Config.ensure_dirs()
-    
     # Convert to Track objects
     track_objects = []
     for i, track in enumerate(tracks, 1):
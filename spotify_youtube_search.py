@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 
+import argparse
 from utils import Config, FileManager, YouTubeSearcher
 
 def main():
+    parser = argparse.ArgumentParser(description='Search YouTube for Spotify tracks')
+    parser.add_argument('--workers', type=int, default=Config.SEARCH_WORKERS,
+                       help=f'Number of concurrent searches (default: {Config.SEARCH_WORKERS})')
+    args = parser.parse_args()
+    Config.setup_logging()
+    
     Config.ensure_dirs()
     
     # Load Spotify tracks from CSV
@@ -10,24 +17,23 @@ def main():
     
     print(f"Processing {len(spotify_tracks)} Spotify tracks...")
     
-    successful_matches = 0
-    
-    for i, track in enumerate(spotify_tracks, 1):
-        print(f"\n--- Spotify Track {i}/{len(spotify_tracks)} ---")
-        
-        track = YouTubeSearcher.search_and_update_track(track)
-        
-        if track.duration_match:
-            successful_matches += 1
+    spotify_tracks, failed = YouTubeSearcher.search_batch_resumable(
+        spotify_tracks, Config.SPOTIFY_TRACKS_WITH_YOUTUBE_NDJSON, max_workers=args.workers
+    )
+    successful_matches = sum(1 for track in spotify_tracks if track.duration_match)
     
     # Save results
     FileManager.save_tracks_json(spotify_tracks, Config.SPOTIFY_TRACKS_WITH_YOUTUBE_JSON)
+    if not failed:
+        Config.SPOTIFY_TRACKS_WITH_YOUTUBE_NDJSON.unlink(missing_ok=True)
     
     print(f"\n{'='*60}")
     print(f"SPOTIFY RESULTS SUMMARY")
     print(f"{'='*60}")
     print(f"Total Spotify tracks processed: {len(spotify_tracks)}")
     print(f"Successful duration matches: {successful_matches}")
+    if failed:
+        print(f"Failed searches: {len(failed)} (run again to retry them)")
     print(f"Match rate: {successful_matches/len(spotify_tracks)*100:.1f}%")
     print(f"\nResults saved to:")
     print(f"- {Config.SPOTIFY_TRACKS_WITH_YOUTUBE_JSON}")
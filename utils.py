@@ -4,36 +4,92 @@ Shared utilities for the music download pipeline.
 Centralizes common functionality to reduce code duplication.
 """
 
+import asyncio
+import atexit
 import json
 import csv
-import subprocess
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
 import time
 import re
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from typing import List, Optional, Dict, Any, Callable, Iterable, Tuple, Union
 from pathlib import Path
 
-@dataclass
+import yt_dlp
+
+log = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional speedup, fall back to stdlib json
+    orjson = None
+
+def json_dumps_compact(data: Any) -> bytes:
+    """Serialize data as compact UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+def json_loads(raw: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or str, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+try:
+    import ijson
+except ImportError:  # optional, streams URL extraction from large track files
+    ijson = None
+
+try:
+    import msgspec
+except ImportError:  # optional, schema-specialized decoding of track files
+    msgspec = None
+
+# __slots__ drops the per-instance __dict__; dataclass only supports it on 3.10+
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class Track:
     """Track data structure used throughout the pipeline"""
     title: str
     artist: str
     duration: str
-    source: str = None
-    url: str = None
-    track_number: int = None
-    youtube_url: str = None
-    youtube_title: str = None
-    youtube_duration: str = None
-    youtube_channel: str = None
+    source: Optional[str] = None
+    url: Optional[str] = None
+    track_number: Optional[int] = None
+    youtube_url: Optional[str] = None
+    youtube_title: Optional[str] = None
+    youtube_duration: Optional[str] = None
+    youtube_channel: Optional[str] = None
     duration_match: bool = False
-    duration_difference: float = None
-    search_query: str = None
+    duration_difference: Optional[int] = None
+    search_query: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of all fields (cheaper than dataclasses.asdict)"""
+        return {name: getattr(self, name) for name in _TRACK_FIELDS}
+
+_TRACK_FIELDS = tuple(f.name for f in fields(Track))
+
+# Decoder specialized for the track file schema, built once. strict=False
+# coerces compatible values (e.g. a 3.0 duration_difference from older
+# files) so it accepts the same files as the plain-JSON fallback.
+_TRACKS_DECODER = msgspec.json.Decoder(List[Track], strict=False) if msgspec is not None else None
 
 class Config:
     """Centralized configuration for file paths"""
     DATA_DIR = Path("data")
     OUTPUT_DIR = Path("output")
+    CACHE_DIR = Path(".cache")
     
     # Input files
     TRACKLIST_TXT = DATA_DIR / "tracklist.txt"
@@ -44,42 +100,300 @@ class Config:
     TRACKS_WITH_YOUTUBE_JSON = DATA_DIR / "tracks_with_youtube.json"
     SPOTIFY_TRACKS_WITH_YOUTUBE_JSON = DATA_DIR / "spotify_tracks_with_youtube.json"
     
+    # Buffer size for files written in many small chunks
+    WRITE_BUFFER_SIZE = 1 << 20
+    
+    # Search progress, one JSON track per line; removed once a run completes
+    TRACKS_WITH_YOUTUBE_NDJSON = DATA_DIR / "tracks_with_youtube.ndjson"
+    SPOTIFY_TRACKS_WITH_YOUTUBE_NDJSON = DATA_DIR / "spotify_tracks_with_youtube.ndjson"
+    
+    # Caches
+    BEATPORT_CACHE = CACHE_DIR / "beatport_cache.sqlite"
+    BEATPORT_CACHE_TTL = 7 * 24 * 3600
+    SEARCH_CACHE = CACHE_DIR / "youtube_search_cache.sqlite"
+    SEARCH_CACHE_TTL = 5.5 * 3600
+    
+    # Log every YouTube search candidate at DEBUG level, not just the chosen one
+    VERBOSE = bool(os.environ.get('VERBOSE'))
+    
+    # Beatport scraping concurrency and global request rate (requests/second)
+    SCRAPE_WORKERS = 8
+    SCRAPE_RATE = 2.0
+    
+    # YouTube search concurrency and global request rate (requests/second)
+    SEARCH_WORKERS = 8
+    SEARCH_RATE = 2.0
+    
+    # Concurrent MP3 downloads, and parallel fragments within a download of
+    # a fragmented (DASH/HLS) format; the usual plain HTTPS bestaudio stream
+    # uses a single connection per download
+    DOWNLOAD_WORKERS = 4
+    CONCURRENT_FRAGMENTS = 4
+    
+    @classmethod
+    def setup_logging(cls):
+        """Show DEBUG output (per-candidate search details) only when VERBOSE is set"""
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+        if cls.VERBOSE:
+            log.setLevel(logging.DEBUG)
+    
     @classmethod
     def ensure_dirs(cls):
         """Create directories if they don't exist"""
         cls.DATA_DIR.mkdir(exist_ok=True)
         cls.OUTPUT_DIR.mkdir(exist_ok=True)
 
+class RateLimiter:
+    """Thread-safe token bucket used to pace requests across worker threads.
+    
+    The rate adapts to the server: backoff() halves it (down to min_rate)
+    when requests are throttled and recover() steps it back up towards the
+    configured rate after successful requests.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1, min_rate: Optional[float] = None):
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 8
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _try_acquire(self) -> float:
+        """Consume a token if one is available; otherwise return seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+    
+    def acquire(self):
+        """Block until a token is available, then consume it"""
+        wait = self._try_acquire()
+        while wait:
+            time.sleep(wait)
+            wait = self._try_acquire()
+    
+    def backoff(self):
+        """Halve the request rate after the server signals throttling"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+    
+    def recover(self):
+        """Step the request rate back towards its configured maximum"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+    
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a token is available"""
+        wait = self._try_acquire()
+        while wait:
+            await asyncio.sleep(wait)
+            wait = self._try_acquire()
+
+class DiskCache:
+    """Persistent JSON value cache backed by SQLite, keyed by SHA1 of a string.
+    
+    The database is opened lazily on first use and shared safely between
+    threads. Entries older than expire_after seconds are treated as misses.
+    Writes are committed every commit_every calls to set() (and at exit),
+    so bulk runs don't pay for a disk sync per entry.
+    """
+    
+    def __init__(self, path: Path, expire_after: Optional[float] = None, commit_every: int = 1):
+        self.path = Path(path)
+        self.expire_after = expire_after
+        self.commit_every = commit_every
+        self._conn = None
+        self._pending = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, ts REAL)'
+            )
+            atexit.register(self.flush)
+        return self._conn
+    
+    @staticmethod
+    def make_key(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def get(self, text: str) -> Optional[Any]:
+        """Return the cached value for text, or None on a miss"""
+        min_ts = time.time() - self.expire_after if self.expire_after is not None else float('-inf')
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT value FROM cache WHERE key = ? AND ts > ?', (self.make_key(text), min_ts)
+            ).fetchone()
+        if row is None:
+            return None
+        return json_loads(row[0])
+    
+    def set(self, text: str, value: Any):
+        """Store a JSON-serializable value for text"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)',
+                (self.make_key(text), json_dumps_compact(value).decode('utf-8'), time.time())
+            )
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                conn.commit()
+                self._pending = 0
+    
+    def flush(self):
+        """Commit any writes not yet committed"""
+        with self._lock:
+            if self._conn is not None and self._pending:
+                self._conn.commit()
+                self._pending = 0
+
 class FileManager:
     """Handles all file I/O operations"""
     
+    @staticmethod
+    def read_json(file_path: Path) -> Any:
+        """Parse a JSON file, using orjson when it is installed"""
+        with open(file_path, 'rb') as file:
+            return json_loads(file.read())
+    
+    @staticmethod
+    def write_json(data: Any, file_path: Path):
+        """Write data as indented UTF-8 JSON, using orjson when it is installed"""
+        if orjson is not None:
+            with open(file_path, 'wb') as file:
+                file.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            # json.dump emits many small writes; a large buffer batches them
+            with open(file_path, 'w', encoding='utf-8', buffering=Config.WRITE_BUFFER_SIZE) as file:
+                json.dump(data, file, indent=2, ensure_ascii=False)
+    
     @staticmethod
     def load_tracks_json(file_path: Path) -> List[Track]:
-        """Load tracks from JSON file"""
-        with open(file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+        """Load all tracks from JSON file into memory.
+        
+        Decodes straight into Track objects with msgspec when it is
+        installed; otherwise parses to dicts first.
+        """
+        if _TRACKS_DECODER is not None:
+            with open(file_path, 'rb') as file:
+                return _TRACKS_DECODER.decode(file.read())
+        data = FileManager.read_json(file_path)
         return [Track(**track) for track in data]
     
+    @staticmethod
+    def load_tracks_ndjson(file_path: Path) -> List[Track]:
+        """Load tracks from a JSON Lines file, or [] if it doesn't exist.
+        
+        A truncated last line (e.g. from an interrupted run) is ignored.
+        """
+        tracks = []
+        if not Path(file_path).exists():
+            return tracks
+        with open(file_path, 'rb') as file:
+            for line in file:
+                try:
+                    tracks.append(Track(**json_loads(line)))
+                except (ValueError, TypeError):
+                    continue
+        return tracks
+    
     @staticmethod
     def save_tracks_json(tracks: List[Track], file_path: Path):
         """Save tracks to JSON file"""
-        data = [asdict(track) for track in tracks]
-        with open(file_path, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=2, ensure_ascii=False)
+        if msgspec is not None:
+            with open(file_path, 'wb') as file:
+                file.write(msgspec.json.format(msgspec.json.encode(tracks), indent=2))
+            return
+        data = [track.to_dict() for track in tracks]
+        FileManager.write_json(data, file_path)
+    
+    @staticmethod
+    def _load_cached(file_path: Path, kind: str, loader: Callable[[Path], Any]) -> Any:
+        """Return loader(file_path), reusing a pickle of the result while the file is unchanged.
+        
+        The cache file name encodes the source path, mtime and size, so any
+        edit to the source invalidates it; stale pickles for the same source
+        are removed when a new one is written.
+        """
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        prefix = f"{kind}_{DiskCache.make_key(str(file_path.resolve()))[:16]}_"
+        cache_path = Config.CACHE_DIR / f"{prefix}{stat.st_mtime_ns}_{stat.st_size}.pkl"
+        
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'rb') as file:
+                    return pickle.load(file)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass
+        
+        data = loader(file_path)
+        
+        Config.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in Config.CACHE_DIR.glob(f"{prefix}*.pkl"):
+            stale.unlink(missing_ok=True)
+        with open(cache_path, 'wb') as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        return data
+    
+    @staticmethod
+    def load_tracks_json_cached(file_path: Path) -> List[Track]:
+        """Load tracks from JSON file, skipping the parse when a pickled copy is current"""
+        return FileManager._load_cached(file_path, 'tracks', FileManager.load_tracks_json)
+    
+    @staticmethod
+    def extract_youtube_urls(file_path: Path) -> List[Optional[str]]:
+        """Return the youtube_url of every track in a JSON file (None where missing).
+        
+        With ijson, only the parser events for each track boundary and its
+        youtube_url are handled; no track dicts or Track objects are built.
+        """
+        if ijson is None:
+            return [track.get('youtube_url') for track in FileManager.read_json(file_path)]
+        
+        youtube_urls = []
+        with open(file_path, 'rb') as file:
+            for prefix, event, value in ijson.parse(file):
+                if prefix == 'item' and event == 'start_map':
+                    youtube_urls.append(None)
+                elif prefix == 'item.youtube_url' and event == 'string':
+                    youtube_urls[-1] = value
+        return youtube_urls
+    
+    @staticmethod
+    def load_youtube_url_column(file_path: Path) -> List[Optional[str]]:
+        """Load the YouTube URL of every track in a JSON file (None where missing).
+        
+        Cached like load_tracks_json_cached so repeated runs skip parsing
+        the file.
+        """
+        return FileManager._load_cached(file_path, 'urls', FileManager.extract_youtube_urls)
     
     @staticmethod
     def load_spotify_csv(file_path: Path) -> List[Track]:
         """Load tracks from Spotify CSV file"""
         tracks = []
-        with open(file_path, 'r', encoding='utf-8') as csvfile:
-            lines = csvfile.readlines()
+        with open(file_path, 'r', encoding='utf-8', newline='') as csvfile:
+            reader = csv.reader(csvfile)
+            next(reader, None)  # skip header
             
-            for i, line in enumerate(lines[1:], 1):
-                parts = line.strip().split(',')
-                if len(parts) >= 3:
-                    title = parts[0]
-                    duration = parts[-1]
-                    artist = ','.join(parts[1:-1]).strip()
+            for i, row in enumerate(reader, 1):
+                if len(row) >= 3:
+                    # The export doesn't quote artist lists, so any extra
+                    # fields between title and duration belong to the artist
+                    title = row[0]
+                    duration = row[-1].strip()
+                    artist = ','.join(row[1:-1]).strip()
                     
                     track = Track(
                         track_number=i,
@@ -92,129 +406,211 @@ class FileManager:
         return tracks
     
     @staticmethod
-    def get_youtube_urls_from_tracks(tracks: List[Track]) -> List[str]:
+    def get_youtube_urls_from_tracks(tracks: Iterable[Track]) -> List[str]:
         """Extract YouTube URLs from tracks that have them"""
-        return [track.youtube_url for track in tracks if track.youtube_url]
+        return FileManager.filter_youtube_urls(track.youtube_url for track in tracks)
+    
+    @staticmethod
+    def filter_youtube_urls(youtube_urls: Iterable[Optional[str]]) -> List[str]:
+        """Drop missing entries from a YouTube URL column"""
+        return [url for url in youtube_urls if url]
 
 class YouTubeSearcher:
     """Handles YouTube search functionality"""
     
+    # Shared by all search threads so the global request rate stays polite
+    _rate_limiter = RateLimiter(Config.SEARCH_RATE)
+    
+    # In-process yt-dlp options. Searches run with process=False, which
+    # already returns the raw search entries without resolving each
+    # candidate's video page
+    _SEARCH_OPTS = {
+        'quiet': True,
+        'no_warnings': True,
+        'skip_download': True,
+    }
+    _local = threading.local()
+    
+    # Candidate lists keyed by normalized search query, shared across runs
+    _search_cache = DiskCache(Config.SEARCH_CACHE, expire_after=Config.SEARCH_CACHE_TTL, commit_every=20)
+    
+    @classmethod
+    def _get_ydl(cls) -> yt_dlp.YoutubeDL:
+        """Return this thread's YoutubeDL instance, creating it on first use"""
+        ydl = getattr(cls._local, 'ydl', None)
+        if ydl is None:
+            ydl = cls._local.ydl = yt_dlp.YoutubeDL(cls._SEARCH_OPTS)
+        return ydl
+    
     @staticmethod
     def duration_to_seconds(duration_str: str) -> int:
-        """Convert duration string (M:SS or MM:SS) to total seconds"""
-        try:
-            if ':' not in duration_str:
-                return 0
-            
-            parts = duration_str.split(':')
-            if len(parts) == 2:
-                minutes, seconds = parts
-                return int(minutes) * 60 + int(seconds)
-            elif len(parts) == 3:
-                hours, minutes, seconds = parts
-                return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+        """Convert duration string (M:SS, MM:SS or H:MM:SS) to total seconds.
+        
+        Parsed in a single pass: each ':' shifts the accumulated value up by
+        a factor of 60. Returns 0 for anything else, including empty fields,
+        stray characters or more than three fields.
+        """
+        if not duration_str or ':' not in duration_str:
+            return 0
+        
+        total = 0
+        value = 0
+        fields = 1
+        has_digits = False
+        for char in duration_str.strip():
+            if char == ':':
+                fields += 1
+                if not has_digits or fields > 3:
+                    return 0
+                total = total * 60 + value
+                value = 0
+                has_digits = False
+            elif '0' <= char <= '9':
+                value = value * 10 + (ord(char) - 48)
+                has_digits = True
             else:
                 return 0
-        except (ValueError, AttributeError):
+        if not has_digits:
             return 0
+        return total * 60 + value
     
     @staticmethod
-    def search_youtube_track(title: str, artist: str, target_duration: str) -> Optional[Dict[str, Any]]:
-        """Search for a track on YouTube and verify by duration using yt-dlp"""
-        try:
-            search_query = title
-            print(f"Searching YouTube for: '{search_query}'")
-            
-            search_url = f"ytsearch5:{search_query}"
-            
-            cmd = [
-                'yt-dlp',
-                '--dump-json',
-                '--no-download',
-                '--quiet',
-                search_url
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                print(f"  Error running yt-dlp: {result.stderr}")
-                return None
-            
-            videos = []
-            for line in result.stdout.strip().split('\n'):
-                if line:
-                    try:
-                        video_data = json.loads(line)
-                        videos.append(video_data)
-                    except json.JSONDecodeError:
-                        continue
-            
-            if not videos:
-                return None
-            
-            target_seconds = YouTubeSearcher.duration_to_seconds(target_duration)
-            
-            for video in videos:
-                video_duration = video.get('duration', 0)
-                video_title = video.get('title', 'Unknown')
-                video_url = video.get('webpage_url', '')
-                video_channel = video.get('uploader', 'Unknown')
-                
-                if video_duration:
-                    minutes = video_duration // 60
-                    seconds = video_duration % 60
-                    duration_str = f"{minutes}:{seconds:02d}"
-                else:
-                    duration_str = "Unknown"
-                
-                duration_diff = abs(video_duration - target_seconds)
-                
-                print(f"  Found: '{video_title}' - Duration: {duration_str} ({video_duration}s) - Diff: {duration_diff}s")
-                
-                if duration_diff <= 5:
-                    return {
-                        'youtube_url': video_url,
-                        'youtube_title': video_title,
-                        'youtube_duration': duration_str,
-                        'youtube_channel': video_channel,
-                        'duration_match': True,
-                        'duration_difference': duration_diff,
-                        'search_query': search_query
+    def durations_to_seconds(durations: Iterable[str]) -> List[int]:
+        """Convert a column of duration strings to seconds in one pass"""
+        convert = YouTubeSearcher.duration_to_seconds
+        return [convert(duration) for duration in durations]
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _fetch_candidates_cached(query_key: str) -> tuple:
+        videos = YouTubeSearcher._search_cache.get(query_key)
+        if videos is None:
+            YouTubeSearcher._rate_limiter.acquire()
+            # process=False returns the search extractor's raw, lazily
+            # generated entries and skips yt-dlp's per-entry playlist
+            # post-processing, which none of the fields below need. It also
+            # bypasses yt-dlp's error wrapping, so network errors arrive as
+            # bare ExtractorErrors while the entries are consumed
+            try:
+                info = YouTubeSearcher._get_ydl().extract_info(
+                    f"ytsearch5:{query_key}", download=False, process=False
+                )
+                # Consuming the entries is what actually sends the request
+                videos = [
+                    {
+                        'url': video.get('webpage_url') or video.get('url', ''),
+                        'title': video.get('title', 'Unknown'),
+                        'duration': int(video.get('duration') or 0),
+                        'channel': video.get('uploader') or video.get('channel') or 'Unknown',
                     }
-            
-            if videos:
-                first_video = videos[0]
-                video_duration = first_video.get('duration', 0)
-                video_title = first_video.get('title', 'Unknown')
-                video_url = first_video.get('webpage_url', '')
-                video_channel = first_video.get('uploader', 'Unknown')
-                
-                if video_duration:
-                    minutes = video_duration // 60
-                    seconds = video_duration % 60
-                    duration_str = f"{minutes}:{seconds:02d}"
-                else:
-                    duration_str = "Unknown"
-                
-                duration_diff = abs(video_duration - target_seconds)
-                
-                return {
-                    'youtube_url': video_url,
-                    'youtube_title': video_title,
-                    'youtube_duration': duration_str,
-                    'youtube_channel': video_channel,
-                    'duration_match': False,
-                    'duration_difference': duration_diff,
-                    'search_query': search_query
-                }
-            
+                    for video in (info or {}).get('entries') or [] if video
+                ]
+            except yt_dlp.utils.YoutubeDLError as e:
+                if '429' in str(e) or 'Too Many Requests' in str(e):
+                    YouTubeSearcher._rate_limiter.backoff()
+                raise
+            YouTubeSearcher._rate_limiter.recover()
+            YouTubeSearcher._search_cache.set(query_key, videos)
+        return tuple(videos)
+    
+    @staticmethod
+    def fetch_candidates(search_query: str) -> tuple:
+        """Return up to 5 YouTube candidates for a query as url/title/duration/channel dicts.
+        
+        Results are memoized in memory and on disk by the lowercased,
+        stripped query, so repeated titles skip yt-dlp entirely.
+        """
+        return YouTubeSearcher._fetch_candidates_cached(search_query.lower().strip())
+    
+    @staticmethod
+    def format_duration(seconds: int) -> str:
+        """Format seconds as M:SS, or 'Unknown' for a missing duration"""
+        if not seconds:
+            return "Unknown"
+        return f"{seconds // 60}:{seconds % 60:02d}"
+    
+    @staticmethod
+    def _build_result(video: Dict[str, Any], duration_diff: int, duration_match: bool,
+                      search_query: str) -> Dict[str, Any]:
+        return {
+            'youtube_url': video['url'],
+            'youtube_title': video['title'],
+            'youtube_duration': YouTubeSearcher.format_duration(video['duration']),
+            'youtube_channel': video['channel'],
+            'duration_match': duration_match,
+            'duration_difference': duration_diff,
+            'search_query': search_query
+        }
+    
+    @staticmethod
+    def _search_youtube_track(title: str, artist: str, target_duration: Union[str, int]) -> Optional[Dict[str, Any]]:
+        """search_youtube_track without the error handling.
+        
+        Returns None only when the search genuinely found nothing; network
+        and throttling errors are raised.
+        """
+        search_query = title
+        log.debug("Searching YouTube for: '%s'", search_query)
+        
+        videos = YouTubeSearcher.fetch_candidates(search_query)
+        
+        if not videos:
             return None
+        
+        if isinstance(target_duration, int):
+            target_seconds = target_duration
+        else:
+            target_seconds = YouTubeSearcher.duration_to_seconds(target_duration)
+        
+        first_diff = None
+        for video in videos:
+            duration_diff = abs(video['duration'] - target_seconds)
+            if first_diff is None:
+                first_diff = duration_diff
+            
+            log.debug("  Found: '%s' - Duration: %ss - Diff: %ss", video['title'], video['duration'], duration_diff)
             
+            if duration_diff <= 5:
+                return YouTubeSearcher._build_result(video, duration_diff, True, search_query)
+        
+        # No duration match; fall back to the top search result
+        return YouTubeSearcher._build_result(videos[0], first_diff, False, search_query)
+    
+    @staticmethod
+    def search_youtube_track(title: str, artist: str, target_duration: Union[str, int]) -> Optional[Dict[str, Any]]:
+        """Search for a track on YouTube and verify by duration using yt-dlp.
+        
+        target_duration may be a duration string or an already-converted
+        number of seconds. Returns None if nothing was found or the search
+        failed.
+        """
+        try:
+            return YouTubeSearcher._search_youtube_track(title, artist, target_duration)
         except Exception as e:
-            print(f"Error searching for '{search_query}': {str(e)}")
+            print(f"Error searching for '{title}': {str(e)}")
             return None
     
+    @staticmethod
+    def apply_search_result(track: Track, youtube_result: Optional[Dict[str, Any]]) -> Track:
+        """Update a track with the result of search_youtube_track"""
+        if youtube_result:
+            track.youtube_url = youtube_result['youtube_url']
+            track.youtube_title = youtube_result['youtube_title']
+            track.youtube_duration = youtube_result['youtube_duration']
+            track.youtube_channel = youtube_result['youtube_channel']
+            track.duration_match = youtube_result['duration_match']
+            track.duration_difference = youtube_result['duration_difference']
+            track.search_query = youtube_result['search_query']
+        else:
+            track.youtube_url = None
+            track.youtube_title = None
+            track.youtube_duration = None
+            track.youtube_channel = None
+            track.duration_match = False
+            track.duration_difference = None
+            track.search_query = track.title
+        return track
+    
     @staticmethod
     def search_and_update_track(track: Track) -> Track:
         """Search YouTube for a track and update it with results"""
@@ -228,43 +624,134 @@ class YouTubeSearcher:
             track.duration
         )
         
+        YouTubeSearcher.apply_search_result(track, youtube_result)
+        
         if youtube_result:
-            track.youtube_url = youtube_result['youtube_url']
-            track.youtube_title = youtube_result['youtube_title']
-            track.youtube_duration = youtube_result['youtube_duration']
-            track.youtube_channel = youtube_result['youtube_channel']
-            track.duration_match = youtube_result['duration_match']
-            track.duration_difference = youtube_result['duration_difference']
-            track.search_query = youtube_result['search_query']
-            
             if youtube_result['duration_match']:
                 print(f"✓ Found matching track: {youtube_result['youtube_url']}")
             else:
                 print(f"⚠ Found track but duration mismatch: {youtube_result['youtube_url']}")
         else:
-            track.youtube_url = None
-            track.youtube_title = None
-            track.youtube_duration = None
-            track.youtube_channel = None
-            track.duration_match = False
-            track.duration_difference = None
-            track.search_query = track.title
             print("✗ No results found")
         
-        time.sleep(1)
         return track
+    
+    @classmethod
+    def search_batch(cls, tracks: List[Track], max_workers: int = Config.SEARCH_WORKERS,
+                     on_result: Optional[Callable[[Track], None]] = None,
+                     on_error: Optional[Callable[[Track, Exception], None]] = None) -> List[Track]:
+        """Search YouTube for many tracks concurrently, updating them in place.
+        
+        Requests are paced globally by the shared rate limiter, so raising
+        max_workers only increases how many searches can wait on the network
+        at once. If given, on_result is called with each track as soon as its
+        search completes, and on_error with each track whose search failed.
+        Failed tracks are left without a YouTube match.
+        """
+        total = len(tracks)
+        
+        # Columns read once up front, so workers only get plain strings and ints
+        titles = [track.title for track in tracks]
+        artists = [track.artist for track in tracks]
+        target_seconds = cls.durations_to_seconds(track.duration for track in tracks)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(cls._search_youtube_track, titles[i], artists[i], target_seconds[i]): i
+                for i in range(total)
+            }
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    track = tracks[futures[future]]
+                    try:
+                        youtube_result = future.result()
+                    except Exception as e:
+                        cls.apply_search_result(track, None)
+                        print(f"[{done}/{total}] {track.title} - ✗ Search failed: {e}")
+                        if on_error is not None:
+                            on_error(track, e)
+                        continue
+                    cls.apply_search_result(track, youtube_result)
+                    
+                    if not youtube_result:
+                        status = "✗ No results found"
+                    elif youtube_result['duration_match']:
+                        status = f"✓ {youtube_result['youtube_url']}"
+                    else:
+                        status = f"⚠ Duration mismatch: {youtube_result['youtube_url']}"
+                    print(f"[{done}/{total}] {track.title} - {status}")
+                    
+                    if on_result is not None:
+                        on_result(track)
+            except BaseException:
+                # Drop queued searches instead of running them all on the way out
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        
+        return tracks
+    
+    @classmethod
+    def search_batch_resumable(cls, tracks: List[Track], progress_path: Path,
+                               max_workers: int = Config.SEARCH_WORKERS,
+                               retries: int = 2) -> Tuple[List[Track], List[Track]]:
+        """Run search_batch, appending each finished track to an NDJSON progress file.
+        
+        Tracks already recorded in progress_path by an earlier, interrupted
+        run are restored from it instead of being searched again. Searches
+        that fail are not recorded and are retried up to retries more times.
+        
+        Returns:
+            (tracks, failed) where failed lists the tracks that still have no
+            search result. The caller should remove the progress file once
+            the final results are saved, unless failed is non-empty.
+        """
+        done = {(track.title, track.artist): track for track in FileManager.load_tracks_ndjson(progress_path)}
+        
+        pending = []
+        for i, track in enumerate(tracks):
+            previous = done.get((track.title, track.artist))
+            if previous is not None:
+                tracks[i] = previous
+            else:
+                pending.append(track)
+        
+        if done:
+            print(f"Resuming: {len(tracks) - len(pending)} tracks already searched, {len(pending)} remaining")
+        
+        failed = []
+        with open(progress_path, 'ab', buffering=Config.WRITE_BUFFER_SIZE) as progress:
+            if progress.tell():
+                # Start on a fresh line in case the last run was cut off mid-record
+                progress.write(b'\n')
+            
+            def record(track):
+                progress.write(json_dumps_compact(track.to_dict()) + b'\n')
+            
+            for attempt in range(retries + 1):
+                if attempt:
+                    print(f"\nRetrying {len(pending)} failed searches...")
+                failed = []
+                cls.search_batch(pending, max_workers=max_workers, on_result=record,
+                                 on_error=lambda track, e: failed.append(track))
+                if not failed:
+                    break
+                pending = failed
+        
+        return tracks, failed
 
 def load_tracks(source: str) -> List[str]:
     """Unified function to load YouTube URLs from either source"""
     Config.ensure_dirs()
     
     if source == 'beatport':
-        tracks = FileManager.load_tracks_json(Config.TRACKS_WITH_YOUTUBE_JSON)
-        print(f"Found {len(FileManager.get_youtube_urls_from_tracks(tracks))} Beatport tracks with YouTube URLs out of {len(tracks)} total tracks")
+        file_path = Config.TRACKS_WITH_YOUTUBE_JSON
     elif source == 'spotify':
-        tracks = FileManager.load_tracks_json(Config.SPOTIFY_TRACKS_WITH_YOUTUBE_JSON)
-        print(f"Found {len(FileManager.get_youtube_urls_from_tracks(tracks))} Spotify tracks with YouTube URLs out of {len(tracks)} total tracks")
+        file_path = Config.SPOTIFY_TRACKS_WITH_YOUTUBE_JSON
     else:
         raise ValueError(f"Unknown source: {source}. Use 'beatport' or 'spotify'")
     
-    return FileManager.get_youtube_urls_from_tracks(tracks)
\ No newline at end of file
+    url_column = FileManager.load_youtube_url_column(file_path)
+    youtube_urls = FileManager.filter_youtube_urls(url_column)
+    
+    print(f"Found {len(youtube_urls)} {source.capitalize()} tracks with YouTube URLs out of {len(url_column)} total tracks")
+    return youtube_urls
@@ -1,33 +1,39 @@
 #!/usr/bin/env python3
 
+import argparse
 from utils import Config, FileManager, YouTubeSearcher, Track
 
 def main():
+    parser = argparse.ArgumentParser(description='Search YouTube for extracted Beatport tracks')
+    parser.add_argument('--workers', type=int, default=Config.SEARCH_WORKERS,
+                       help=f'Number of concurrent searches (default: {Config.SEARCH_WORKERS})')
+    args = parser.parse_args()
+    Config.setup_logging()
+    
     Config.ensure_dirs()
     
     # Load extracted tracks
-    tracks_data = FileManager.load_tracks_json(Config.EXTRACTED_TRACKS_JSON)
+    tracks_data = FileManager.load_tracks_json_cached(Config.EXTRACTED_TRACKS_JSON)
     
     print(f"Processing {len(tracks_data)} tracks...")
     
-    successful_matches = 0
-    
-    for i, track in enumerate(tracks_data, 1):
-        print(f"\n--- Track {i}/{len(tracks_data)} ---")
-        
-        track = YouTubeSearcher.search_and_update_track(track)
-        
-        if track.duration_match:
-            successful_matches += 1
+    tracks_data, failed = YouTubeSearcher.search_batch_resumable(
+        tracks_data, Config.TRACKS_WITH_YOUTUBE_NDJSON, max_workers=args.workers
+    )
+    successful_matches = sum(1 for track in tracks_data if track.duration_match)
     
     # Save results
     FileManager.save_tracks_json(tracks_data, Config.TRACKS_WITH_YOUTUBE_JSON)
+    if not failed:
+        Config.TRACKS_WITH_YOUTUBE_NDJSON.unlink(missing_ok=True)
     
     print(f"\n{'='*60}")
     print(f"RESULTS SUMMARY")
     print(f"{'='*60}")
     print(f"Total tracks processed: {len(tracks_data)}")
     print(f"Successful duration matches: {successful_matches}")
+    if failed:
+        print(f"Failed searches: {len(failed)} (run again to retry them)")
     print(f"Match rate: {successful_matches/len(tracks_data)*100:.1f}%")
     print(f"\nResults saved to:")
     print(f"- {Config.TRACKS_WITH_YOUTUBE_JSON}")
@@ -1,15 +1,91 @@
 import yt_dlp
 import os
-from typing import List
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+from typing import List, Optional, Tuple
 from utils import Config
 
-def download_youtube_to_mp3(urls: List[str], output_dir: str = None):
+OUTTMPL = '%(title)s.%(ext)s'
+
+# Options shared by every worker; only the output/temp paths vary
+_YDL_OPTS = {
+    'format': 'bestaudio/best',
+    'outtmpl': OUTTMPL,
+    # Parallel fragments only apply to fragmented (DASH/HLS) formats; plain
+    # HTTPS audio streams are fetched as sequential 10 MiB ranged requests,
+    # which keeps YouTube from throttling one long-lived connection
+    'concurrent_fragment_downloads': Config.CONCURRENT_FRAGMENTS,
+    'http_chunk_size': 10 * 1024 * 1024,
+    'retries': 10,
+    'postprocessors': [{
+        'key': 'FFmpegExtractAudio',
+        'preferredcodec': 'mp3',
+        'preferredquality': '192',
+    }],
+}
+
+def build_ydl_opts(output_dir: str, temp_dir: str = None) -> dict:
+    """yt-dlp options for extracting MP3 into output_dir"""
+    paths = {'home': output_dir}
+    if temp_dir is not None:
+        paths['temp'] = temp_dir
+    return {**_YDL_OPTS, 'paths': paths}
+
+@contextmanager
+def worker_ydl(output_dir: str):
+    """
+    YoutubeDL instance for one download worker thread.
+    
+    Partial and pre-conversion files go to a private temp directory so
+    concurrent workers never write to the same intermediate file; finished
+    MP3s are moved into output_dir.
+    """
+    temp_dir = tempfile.mkdtemp(prefix='.partial-', dir=output_dir)
+    try:
+        with yt_dlp.YoutubeDL(build_ydl_opts(output_dir, temp_dir)) as ydl:
+            yield ydl
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def download_url(url: str, ydl: yt_dlp.YoutubeDL) -> Optional[str]:
+    """
+    Download a single YouTube URL as MP3 using an existing YoutubeDL instance.
+    
+    Returns:
+        None on success, otherwise the error message
+    """
+    try:
+        print(f"Downloading: {url}")
+        ydl.download([url])
+        print(f"✓ Successfully downloaded: {url}")
+        return None
+    except Exception as e:
+        print(f"✗ Failed to download {url}: {e}")
+        return str(e)
+
+def print_download_summary(successful_downloads: List[str], failed_downloads: List[Tuple[str, str]]):
+    """Print success/failure counts and the errors for failed URLs"""
+    print(f"\n--- Download Summary ---")
+    print(f"Successful: {len(successful_downloads)}")
+    print(f"Failed: {len(failed_downloads)}")
+    
+    if failed_downloads:
+        print("\nFailed downloads:")
+        for url, error in failed_downloads:
+            print(f"  {url}: {error}")
+
+def download_youtube_to_mp3(urls: List[str], output_dir: str = None,
+                           max_workers: int = Config.DOWNLOAD_WORKERS):
     """
     Download YouTube videos as MP3 files from a list of URLs.
     
     Args:
         urls: List of YouTube URLs to download
         output_dir: Directory to save the MP3 files (default: Config.OUTPUT_DIR)
+        max_workers: Number of concurrent downloads (default: Config.DOWNLOAD_WORKERS)
     """
     if output_dir is None:
         output_dir = str(Config.OUTPUT_DIR)
@@ -17,40 +93,40 @@ def download_youtube_to_mp3(urls: List[str], output_dir: str = None):
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
-    # yt-dlp options for extracting MP3
-    ydl_opts = {
-        'format': 'bestaudio/best',
-        'outtmpl': os.path.join(output_dir, '%(title)s.%(ext)s'),
-        'postprocessors': [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }],
-    }
+    # Duplicate URLs would race on the same output file
+    urls = list(dict.fromkeys(urls))
     
     successful_downloads = []
     failed_downloads = []
     
-    for url in urls:
-        try:
-            print(f"Downloading: {url}")
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-            successful_downloads.append(url)
-            print(f"✓ Successfully downloaded: {url}")
-        except Exception as e:
-            failed_downloads.append((url, str(e)))
-            print(f"✗ Failed to download {url}: {e}")
+    # One YoutubeDL per worker thread, created on its first URL and reused
+    local = threading.local()
+    stack_lock = threading.Lock()
     
-    # Summary
-    print(f"\n--- Download Summary ---")
-    print(f"Successful: {len(successful_downloads)}")
-    print(f"Failed: {len(failed_downloads)}")
+    with ExitStack() as stack:
+        def download(url):
+            ydl = getattr(local, 'ydl', None)
+            if ydl is None:
+                try:
+                    with stack_lock:
+                        ydl = local.ydl = stack.enter_context(worker_ydl(output_dir))
+                except Exception as e:
+                    # Report it against this URL; the next one retries the setup
+                    print(f"✗ Failed to download {url}: {e}")
+                    return str(e)
+            return download_url(url, ydl)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(download, url): url for url in urls}
+            for future in as_completed(futures):
+                url = futures[future]
+                error = future.result()
+                if error is None:
+                    successful_downloads.append(url)
+                else:
+                    failed_downloads.append((url, error))
     
-    if failed_downloads:
-        print("\nFailed downloads:")
-        for url, error in failed_downloads:
-            print(f"  {url}: {error}")
+    print_download_summary(successful_downloads, failed_downloads)
 
 if __name__ == "__main__":
     # Example usage